@@ -49,7 +49,7 @@ impl ListCommand {
             }))
         };
 
-        if let Ok(client) = args.api_args.api_client() {
+        if let Some(client) = args.api_args.opt_api_client()? {
             for info in client.get_devices().await? {
                 let mut device = state.device_mut(&info.sku, &info.device).await;
                 device.set_http_device_info(info);
@@ -1,4 +1,5 @@
 use crate::lan_api::Client as LanClient;
+use crate::opt_env_var;
 use crate::service::device::Device;
 use crate::service::hass::spawn_hass_integration;
 use crate::service::http::run_http_server;
@@ -10,6 +11,8 @@ use chrono::Utc;
 use once_cell::sync::Lazy;
 use std::collections::HashMap;
 use std::sync::Arc;
+use tokio::sync::Semaphore;
+use tokio::task::JoinSet;
 use tokio::time::{sleep, Duration};
 
 pub const POLL_INTERVAL: Lazy<chrono::Duration> = Lazy::new(|| chrono::Duration::seconds(900));
@@ -19,6 +22,12 @@ pub struct ServeCommand {
     /// The port on which the HTTP API will listen
     #[arg(long, default_value_t = 8056)]
     http_port: u16,
+
+    /// The maximum number of devices that will be polled concurrently.
+    /// You may also set this via the GOVEE_MAX_PARALLEL_POLLS
+    /// environment variable. If unspecified, uses 4.
+    #[arg(long)]
+    max_parallel_polls: Option<usize>,
 }
 
 async fn poll_single_device(state: &StateHandle, device: &Device) -> anyhow::Result<()> {
@@ -72,12 +81,32 @@ async fn poll_single_device(state: &StateHandle, device: &Device) -> anyhow::Res
     Ok(())
 }
 
-async fn periodic_state_poll(state: StateHandle) -> anyhow::Result<()> {
+async fn periodic_state_poll(state: StateHandle, max_parallel: usize) -> anyhow::Result<()> {
     sleep(Duration::from_secs(20)).await;
+
+    // Polling is dominated by waiting on the network, so we poll
+    // several devices at once, bounded by the semaphore so that
+    // we don't burst through the API rate limits.
+    let semaphore = Arc::new(Semaphore::new(max_parallel.max(1)));
+
     loop {
+        let mut polls = JoinSet::new();
         for d in state.devices().await {
-            if let Err(err) = poll_single_device(&state, &d).await {
-                log::error!("while polling {d}: {err:#}");
+            let state = state.clone();
+            let semaphore = semaphore.clone();
+            polls.spawn(async move {
+                let Ok(_permit) = semaphore.acquire_owned().await else {
+                    return;
+                };
+                if let Err(err) = poll_single_device(&state, &d).await {
+                    log::error!("while polling {d}: {err:#}");
+                }
+            });
+        }
+
+        while let Some(result) = polls.join_next().await {
+            if let Err(err) = result {
+                log::error!("periodic_state_poll: poll task failed: {err:#}");
             }
         }
 
@@ -86,6 +115,13 @@ async fn periodic_state_poll(state: StateHandle) -> anyhow::Result<()> {
 }
 
 impl ServeCommand {
+    fn max_parallel_polls(&self) -> anyhow::Result<usize> {
+        match self.max_parallel_polls {
+            Some(n) => Ok(n),
+            None => Ok(opt_env_var("GOVEE_MAX_PARALLEL_POLLS")?.unwrap_or(4)),
+        }
+    }
+
     pub async fn run(&self, args: &crate::Args) -> anyhow::Result<()> {
         log::info!("Starting service. version {}", govee_version());
         let state = Arc::new(crate::service::state::State::new());
@@ -93,7 +129,7 @@ impl ServeCommand {
         // First, use the HTTP APIs to determine the list of devices and
         // their names.
 
-        if let Ok(client) = args.api_args.api_client() {
+        if let Some(client) = args.api_args.opt_api_client()? {
             log::info!("Querying platform API for device list");
             for info in client.get_devices().await? {
                 let mut device = state.device_mut(&info.sku, &info.device).await;
@@ -170,7 +206,7 @@ impl ServeCommand {
             if let Some(lan) = &device.lan_device {
                 log::info!("  LAN API: ip={:?}", lan.ip);
             }
-            if let Some(http_info) = &device.http_device_info {
+            if let Some(http_info) = device.http_device_info() {
                 let kind = &http_info.device_type;
                 let rgb = http_info.supports_rgb();
                 let bright = http_info.supports_brightness();
@@ -211,7 +247,7 @@ impl ServeCommand {
                         "  5) The hardware version of the device is too old to enable the LAN API."
                     );
                 }
-            } else if device.http_device_info.is_none() {
+            } else if device.http_device_info().is_none() {
                 log::warn!("  Unknown device type. Cannot map to Home Assistant.");
                 if state.get_platform_client().await.is_none() {
                     log::warn!(
@@ -227,8 +263,9 @@ impl ServeCommand {
         // Start periodic status polling
         {
             let state = state.clone();
+            let max_parallel = self.max_parallel_polls()?;
             tokio::spawn(async move {
-                if let Err(err) = periodic_state_poll(state).await {
+                if let Err(err) = periodic_state_poll(state, max_parallel).await {
                     log::error!("periodic_state_poll: {err:#}");
                 }
             });
@@ -173,7 +173,7 @@ pub async fn enumerate_entities_for_device<'a>(
         }
     }
 
-    if let Some(info) = &d.http_device_info {
+    if let Some(info) = d.http_device_info() {
         for cap in &info.capabilities {
             match &cap.kind {
                 DeviceCapabilityKind::Toggle | DeviceCapabilityKind::OnOff => {
@@ -209,7 +209,7 @@ pub async fn enumerate_entities_for_device<'a>(
             }
         }
 
-        if let Some(segments) = info.supports_segmented_rgb() {
+        if let Some(segments) = d.supports_segmented_rgb() {
             for n in segments {
                 entities.add(DeviceLight::for_device(&d, state, Some(n)).await?);
             }
@@ -101,20 +101,18 @@ impl Humidifier {
             .map(|wm| wm.get_mode_names())
             .unwrap_or(vec![]);
 
-        if let Some(info) = &device.http_device_info {
-            if let Some(cap) = info.capability_by_instance("humidity") {
-                match &cap.parameters {
-                    Some(DeviceParameters::Integer {
-                        range: IntegerRange { min, max, .. },
-                        unit,
-                    }) => {
-                        if unit.as_deref() == Some("unit.percent") {
-                            min_humidity.replace(*min as u8);
-                            max_humidity.replace(*max as u8);
-                        }
+        if let Some(cap) = device.get_capability_by_instance("humidity") {
+            match &cap.parameters {
+                Some(DeviceParameters::Integer {
+                    range: IntegerRange { min, max, .. },
+                    unit,
+                }) => {
+                    if unit.as_deref() == Some("unit.percent") {
+                        min_humidity.replace(*min as u8);
+                        max_humidity.replace(*max as u8);
                     }
-                    _ => {}
                 }
+                _ => {}
             }
         }
 
@@ -280,29 +278,27 @@ pub async fn mqtt_humidifier_set_target(
     let use_iot = device.pollable_via_iot() && state.get_iot_client().await.is_some();
 
     if !use_iot {
-        if let Some(info) = &device.http_device_info {
-            if let Some(cap) = info.capability_by_instance("humidity") {
-                state.device_control(&device, cap, percent).await?;
-
-                // We're running in optimistic mode; stash
-                // the last set value so that we can report it
-                // to hass
-                state
-                    .device_mut(&device.sku, &device.id)
-                    .await
-                    .set_target_humidity(percent as u8);
-
-                // For the H7160 at least, setting the humidity
-                // will put the device into auto mode and turn
-                // it on, however, we don't know that the device
-                // is actually turned on.
-                //
-                // This is handled by the device_was_controlled
-                // stuff; it will cause us to poll the device
-                // after a short delay, and that should fix up
-                // the reported device state.
-                return Ok(());
-            }
+        if let Some(cap) = device.get_capability_by_instance("humidity") {
+            state.device_control(&device, cap, percent).await?;
+
+            // We're running in optimistic mode; stash
+            // the last set value so that we can report it
+            // to hass
+            state
+                .device_mut(&device.sku, &device.id)
+                .await
+                .set_target_humidity(percent as u8);
+
+            // For the H7160 at least, setting the humidity
+            // will put the device into auto mode and turn
+            // it on, however, we don't know that the device
+            // is actually turned on.
+            //
+            // This is handled by the device_was_controlled
+            // stuff; it will cause us to poll the device
+            // after a short delay, and that should fix up
+            // the reported device state.
+            return Ok(());
         }
     }
 
@@ -5,6 +5,7 @@ use anyhow::Context;
 use async_trait::async_trait;
 use serde::Serialize;
 use std::sync::Arc;
+use tokio::task::JoinSet;
 
 #[async_trait]
 pub trait EntityInstance: Send + Sync {
@@ -53,9 +54,20 @@ impl EntityList {
         state: &StateHandle,
         client: &HassClient,
     ) -> anyhow::Result<()> {
+        // Hand all of the configs to the mqtt client in one burst,
+        // rather than waiting for each publish to complete before
+        // starting the next one, so that they can be coalesced
+        // into fewer writes to the broker.
+        let mut publishes = JoinSet::new();
         for e in &self.entities {
-            e.publish_config(state, client)
-                .await
+            let e = e.clone();
+            let state = state.clone();
+            let client = client.clone();
+            publishes.spawn(async move { e.publish_config(&state, &client).await });
+        }
+        while let Some(result) = publishes.join_next().await {
+            result
+                .context("EntityList::publish_config")?
                 .context("EntityList::publish_config")?;
         }
         Ok(())
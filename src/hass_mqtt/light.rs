@@ -197,11 +197,7 @@ impl DeviceLight {
                 .as_ref()
                 .map(|q| q.supports_brightness)
                 .unwrap_or(false)
-            || device
-                .http_device_info
-                .as_ref()
-                .map(|info| info.supports_brightness())
-                .unwrap_or(false);
+            || device.get_capability_by_instance("brightness").is_some();
 
         let name = match segment {
             Some(n) => Some(format!("Segment {:03}", n + 1)),
@@ -112,30 +112,25 @@ impl CapabilitySensor {
             inst = topic_safe_string(&instance.instance)
         );
 
-        let unit_of_measurement = match instance.instance.as_str() {
-            "sensorTemperature" => Some(state.get_temperature_scale().await.unit_of_measurement()),
-            "sensorHumidity" => Some("%"),
-            _ => None,
-        };
-
-        let device_class = match instance.instance.as_str() {
-            "sensorTemperature" => Some(DEVICE_CLASS_TEMPERATURE),
-            "sensorHumidity" => Some(DEVICE_CLASS_HUMIDITY),
-            _ => None,
-        };
-
-        let state_class = match instance.instance.as_str() {
-            "sensorTemperature" => Some(StateClass::Measurement),
-            "sensorHumidity" => Some(StateClass::Measurement),
-            _ => None,
-        };
-
-        let name = match instance.instance.as_str() {
-            "sensorTemperature" => "Temperature".to_string(),
-            "sensorHumidity" => "Humidity".to_string(),
-            "online" => "Connected to Govee Cloud".to_string(),
-            _ => instance.instance.to_string(),
-        };
+        // Entities are re-enumerated on every state change, so resolve
+        // all of the presentation details in a single match
+        let (name, device_class, state_class, unit_of_measurement) =
+            match instance.instance.as_str() {
+                "sensorTemperature" => (
+                    "Temperature".to_string(),
+                    Some(DEVICE_CLASS_TEMPERATURE),
+                    Some(StateClass::Measurement),
+                    Some(state.get_temperature_scale().await.unit_of_measurement()),
+                ),
+                "sensorHumidity" => (
+                    "Humidity".to_string(),
+                    Some(DEVICE_CLASS_HUMIDITY),
+                    Some(StateClass::Measurement),
+                    Some("%"),
+                ),
+                "online" => ("Connected to Govee Cloud".to_string(), None, None, None),
+                _ => (instance.instance.to_string(), None, None, None),
+            };
 
         Ok(Self {
             sensor: SensorConfig {
@@ -150,7 +145,7 @@ impl CapabilitySensor {
                     icon: None,
                 },
                 state_topic: format!("gv2mqtt/sensor/{unique_id}/state"),
-                state_class: state_class,
+                state_class,
                 unit_of_measurement,
                 json_attributes_topic: None,
             },
@@ -274,8 +269,8 @@ impl EntityInstance for DeviceStatusDiagnostic {
         let iot_state = device.compute_iot_device_state();
         let lan_state = device.compute_lan_device_state();
         let http_state = device.compute_http_device_state();
-        let platform_metadata = &device.http_device_info;
-        let platform_state = &device.http_device_state;
+        let platform_metadata = device.http_device_info();
+        let platform_state = device.http_device_state();
         let device_state = device.device_state();
 
         let now = Utc::now();
@@ -13,12 +13,11 @@ pub struct ParsedWorkMode {
 
 impl ParsedWorkMode {
     pub fn with_device(device: &ServiceDevice) -> anyhow::Result<Self> {
-        let info = device
-            .http_device_info
-            .as_ref()
-            .ok_or_else(|| anyhow!("no platform state, so no known work mode"))?;
-        let cap = info
-            .capability_by_instance("workMode")
+        if device.http_device_info().is_none() {
+            anyhow::bail!("no platform state, so no known work mode");
+        }
+        let cap = device
+            .get_capability_by_instance("workMode")
             .ok_or_else(|| anyhow!("device has no workMode capability"))?;
         let mut parsed = Self::with_capability(cap)?;
         parsed.adjust_for_device(&device.sku);
@@ -181,7 +180,7 @@ impl WorkMode {
         }
 
         if let Some(range) = opt.extras.get("range") {
-            if let Ok(range) = serde_json::from_value::<ModeRange>(range.clone()) {
+            if let Ok(range) = ModeRange::deserialize(range) {
                 self.value_range = Some(range.min..range.max + 1);
                 return;
             }
@@ -197,7 +196,7 @@ impl WorkMode {
             return;
         };
 
-        let Ok(options) = serde_json::from_value::<Vec<ModeOption>>(options.clone()) else {
+        let Ok(options) = Vec::<ModeOption>::deserialize(options) else {
             return;
         };
 
@@ -5,11 +5,15 @@ use crate::service::state::sort_and_dedup_scenes;
 use crate::temperature::{TemperatureUnits, TemperatureValue};
 use crate::undoc_api::GoveeUndocumentedApi;
 use anyhow::Context;
-use reqwest::Method;
+use chrono::Utc;
+use parking_lot::Mutex;
+use rand::Rng;
+use reqwest::{Method, StatusCode};
 use serde::{Deserialize, Deserializer, Serialize, Serializer};
 use serde_json::{json, Value as JsonValue};
 use std::collections::HashMap;
-use std::time::Duration;
+use std::sync::Arc;
+use std::time::{Duration, Instant};
 use thiserror::Error;
 
 // This file implements the Govee Platform API V1 as described at:
@@ -23,6 +27,21 @@ const SERVER: &str = "https://openapi.api.govee.com";
 pub const ONE_WEEK: Duration = Duration::from_secs(86400 * 7);
 pub const FIVE_MINUTES: Duration = Duration::from_secs(5 * 60);
 
+/// How many times a throttled or failed request will be retried
+const MAX_RETRIES: usize = 4;
+/// The smallest delay between retries
+const RETRY_BASE_DELAY: Duration = Duration::from_secs(1);
+/// The largest delay between retries, unless the server
+/// tells us otherwise via Retry-After
+const RETRY_MAX_DELAY: Duration = Duration::from_secs(60);
+
+// Defaults for the GoveeApiArguments tuning options
+const DEFAULT_HTTP_POOL_KEEPALIVE: usize = 100;
+const DEFAULT_HTTP_POOL_TIMEOUT_SECS: u64 = 60;
+const DEFAULT_BREAKER_THRESHOLD: usize = 5;
+const DEFAULT_BREAKER_RESET_SECS: u64 = 30;
+const DEFAULT_RATE_PER_MIN: u32 = 60;
+
 fn endpoint(url: &str) -> String {
     format!("{SERVER}{url}")
 }
@@ -33,6 +52,60 @@ pub struct GoveeApiArguments {
     /// the GOVEE_API_KEY environment variable.
     #[arg(long, global = true)]
     pub api_key: Option<String>,
+
+    /// The maximum number of idle connections to the Govee Platform API
+    /// that will be kept open for reuse.
+    /// You may also set this via the GOVEE_HTTP_POOL_KEEPALIVE
+    /// environment variable. If unspecified, uses 100.
+    #[arg(long, global = true)]
+    pub http_pool_keepalive: Option<usize>,
+
+    /// How long, in seconds, an idle connection to the Govee Platform API
+    /// will be kept open for reuse.
+    /// You may also set this via the GOVEE_HTTP_POOL_TIMEOUT
+    /// environment variable. If unspecified, uses 60.
+    #[arg(long, global = true)]
+    pub http_pool_timeout: Option<u64>,
+
+    /// The maximum number of idle connections kept open for reading
+    /// device lists and state from the Govee Platform API.
+    /// You may also set this via the GOVEE_READ_POOL_SIZE
+    /// environment variable. If unspecified, uses the
+    /// http-pool-keepalive value.
+    #[arg(long, global = true)]
+    pub read_pool_size: Option<usize>,
+
+    /// The maximum number of idle connections kept open for sending
+    /// control requests to the Govee Platform API.
+    /// You may also set this via the GOVEE_WRITE_POOL_SIZE
+    /// environment variable. If unspecified, uses the
+    /// http-pool-keepalive value.
+    #[arg(long, global = true)]
+    pub write_pool_size: Option<usize>,
+
+    /// How many consecutive Platform API failures are tolerated before
+    /// we stop sending requests for a while.
+    /// You may also set this via the GOVEE_BREAKER_THRESHOLD
+    /// environment variable. If unspecified, uses 5.
+    /// Set to 0 to disable.
+    #[arg(long, global = true)]
+    pub breaker_threshold: Option<usize>,
+
+    /// How long, in seconds, to stop sending Platform API requests
+    /// once the failure threshold has been reached.
+    /// You may also set this via the GOVEE_BREAKER_RESET_SECONDS
+    /// environment variable. If unspecified, uses 30.
+    #[arg(long, global = true)]
+    pub breaker_reset_seconds: Option<u64>,
+
+    /// The maximum number of Platform API requests to send per minute.
+    /// Requests are sent immediately while within this budget, and
+    /// are delayed only as long as needed when it is exhausted.
+    /// You may also set this via the GOVEE_RATE_PER_MIN
+    /// environment variable. If unspecified, uses 60.
+    /// Set to 0 to disable.
+    #[arg(long, global = true)]
+    pub rate_per_min: Option<u32>,
 }
 
 impl GoveeApiArguments {
@@ -52,20 +125,429 @@ impl GoveeApiArguments {
         })
     }
 
+    pub fn http_pool_keepalive(&self) -> anyhow::Result<usize> {
+        match self.http_pool_keepalive {
+            Some(n) => Ok(n),
+            None => Ok(
+                opt_env_var("GOVEE_HTTP_POOL_KEEPALIVE")?.unwrap_or(DEFAULT_HTTP_POOL_KEEPALIVE)
+            ),
+        }
+    }
+
+    pub fn http_pool_timeout(&self) -> anyhow::Result<Duration> {
+        let secs = match self.http_pool_timeout {
+            Some(n) => n,
+            None => {
+                opt_env_var("GOVEE_HTTP_POOL_TIMEOUT")?.unwrap_or(DEFAULT_HTTP_POOL_TIMEOUT_SECS)
+            }
+        };
+        Ok(Duration::from_secs(secs))
+    }
+
+    pub fn read_pool_size(&self) -> anyhow::Result<usize> {
+        match self.read_pool_size {
+            Some(n) => Ok(n),
+            None => match opt_env_var("GOVEE_READ_POOL_SIZE")? {
+                Some(n) => Ok(n),
+                None => self.http_pool_keepalive(),
+            },
+        }
+    }
+
+    pub fn write_pool_size(&self) -> anyhow::Result<usize> {
+        match self.write_pool_size {
+            Some(n) => Ok(n),
+            None => match opt_env_var("GOVEE_WRITE_POOL_SIZE")? {
+                Some(n) => Ok(n),
+                None => self.http_pool_keepalive(),
+            },
+        }
+    }
+
+    pub fn breaker_threshold(&self) -> anyhow::Result<usize> {
+        match self.breaker_threshold {
+            Some(n) => Ok(n),
+            None => {
+                Ok(opt_env_var("GOVEE_BREAKER_THRESHOLD")?.unwrap_or(DEFAULT_BREAKER_THRESHOLD))
+            }
+        }
+    }
+
+    pub fn breaker_reset(&self) -> anyhow::Result<Duration> {
+        let secs = match self.breaker_reset_seconds {
+            Some(n) => n,
+            None => {
+                opt_env_var("GOVEE_BREAKER_RESET_SECONDS")?.unwrap_or(DEFAULT_BREAKER_RESET_SECS)
+            }
+        };
+        Ok(Duration::from_secs(secs))
+    }
+
+    pub fn rate_per_min(&self) -> anyhow::Result<u32> {
+        match self.rate_per_min {
+            Some(n) => Ok(n),
+            None => Ok(opt_env_var("GOVEE_RATE_PER_MIN")?.unwrap_or(DEFAULT_RATE_PER_MIN)),
+        }
+    }
+
     pub fn api_client(&self) -> anyhow::Result<GoveeApiClient> {
-        let key = self.api_key()?;
-        Ok(GoveeApiClient::new(key))
+        self.build_api_client(self.api_key()?)
+    }
+
+    /// Returns None if no API key has been configured, so that the
+    /// Platform API can be treated as optional. Any other problem with
+    /// the configuration is reported as an error.
+    pub fn opt_api_client(&self) -> anyhow::Result<Option<GoveeApiClient>> {
+        match self.opt_api_key()? {
+            Some(key) => Ok(Some(self.build_api_client(key)?)),
+            None => Ok(None),
+        }
+    }
+
+    fn build_api_client(&self, key: String) -> anyhow::Result<GoveeApiClient> {
+        let idle_timeout = self.http_pool_timeout()?;
+        GoveeApiClient::new(
+            key,
+            GoveeApiClientConfig {
+                read_pool: HttpPoolConfig {
+                    max_idle_per_host: self.read_pool_size()?,
+                    idle_timeout,
+                },
+                write_pool: HttpPoolConfig {
+                    max_idle_per_host: self.write_pool_size()?,
+                    idle_timeout,
+                },
+                breaker_threshold: self.breaker_threshold()?,
+                breaker_reset: self.breaker_reset()?,
+                rate_per_min: self.rate_per_min()?,
+            },
+        )
+    }
+}
+
+/// Settings used to construct a GoveeApiClient
+#[derive(Debug, Clone, Copy)]
+pub struct GoveeApiClientConfig {
+    /// Pool used for device lists, state and scenes
+    pub read_pool: HttpPoolConfig,
+    /// Pool used for device control
+    pub write_pool: HttpPoolConfig,
+    pub breaker_threshold: usize,
+    pub breaker_reset: Duration,
+    pub rate_per_min: u32,
+}
+
+/// Connection pool settings for the HTTP client used to talk
+/// to the Platform API.
+#[derive(Debug, Clone, Copy)]
+pub struct HttpPoolConfig {
+    pub max_idle_per_host: usize,
+    pub idle_timeout: Duration,
+}
+
+impl HttpPoolConfig {
+    fn build_client(&self) -> anyhow::Result<reqwest::Client> {
+        // All of our requests go to the same host, so we keep the
+        // connections alive and reuse them rather than paying for
+        // a fresh TCP + TLS handshake on every request.
+        // HTTP/2 will be negotiated via ALPN when the server offers it,
+        // allowing concurrent requests to share a single connection.
+        reqwest::Client::builder()
+            .timeout(Duration::from_secs(60))
+            .pool_max_idle_per_host(self.max_idle_per_host)
+            .pool_idle_timeout(self.idle_timeout)
+            .http2_adaptive_window(true)
+            .build()
+            .context("building Platform API http client")
+    }
+}
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum CircuitState {
+    /// Requests flow normally
+    Closed,
+    /// Requests fail fast until the reset period has elapsed
+    Open,
+    /// A single trial request is in flight to see if the
+    /// service has recovered
+    HalfOpen,
+}
+
+#[derive(Debug)]
+struct CircuitInner {
+    state: CircuitState,
+    fail_count: usize,
+    opened_at: Option<Instant>,
+}
+
+/// Tracks consecutive Platform API failures so that we can stop
+/// hammering the service while it is having problems, rather than
+/// piling retries on top of retries for every device on every
+/// poll cycle.
+#[derive(Debug)]
+pub struct CircuitBreaker {
+    name: &'static str,
+    threshold: usize,
+    reset_after: Duration,
+    inner: Mutex<CircuitInner>,
+}
+
+impl CircuitBreaker {
+    /// Create a breaker that opens after `threshold` consecutive
+    /// failures and allows a trial request after `reset_after`.
+    /// A threshold of 0 disables the breaker.
+    /// `name` identifies the breaker in log messages.
+    pub fn new(name: &'static str, threshold: usize, reset_after: Duration) -> Self {
+        Self {
+            name,
+            threshold,
+            reset_after,
+            inner: Mutex::new(CircuitInner {
+                state: CircuitState::Closed,
+                fail_count: 0,
+                opened_at: None,
+            }),
+        }
+    }
+
+    /// Returns an error if requests should not be attempted right now,
+    /// otherwise a permit through which the outcome must be reported
+    fn check(&self) -> Result<CircuitPermit<'_>, CircuitOpen> {
+        let mut inner = self.inner.lock();
+        match inner.state {
+            CircuitState::Closed => Ok(CircuitPermit::new(self, false)),
+            CircuitState::HalfOpen => Err(CircuitOpen {
+                retry_in: Duration::ZERO,
+            }),
+            CircuitState::Open => {
+                let elapsed = inner
+                    .opened_at
+                    .map(|t| t.elapsed())
+                    .unwrap_or(self.reset_after);
+                if elapsed >= self.reset_after {
+                    log::info!(
+                        "Platform API {} circuit breaker is half-open; trying a request",
+                        self.name
+                    );
+                    inner.state = CircuitState::HalfOpen;
+                    Ok(CircuitPermit::new(self, true))
+                } else {
+                    Err(CircuitOpen {
+                        retry_in: self.reset_after - elapsed,
+                    })
+                }
+            }
+        }
+    }
+
+    fn record_success(&self) {
+        let mut inner = self.inner.lock();
+        if inner.state != CircuitState::Closed {
+            log::info!("Platform API {} circuit breaker is closed again", self.name);
+        }
+        inner.state = CircuitState::Closed;
+        inner.fail_count = 0;
+        inner.opened_at = None;
+    }
+
+    fn record_failure(&self, trial: bool) {
+        if self.threshold == 0 {
+            return;
+        }
+        let mut inner = self.inner.lock();
+        inner.fail_count += 1;
+        let trip = match inner.state {
+            CircuitState::Closed => inner.fail_count >= self.threshold,
+            // Only the trial decides whether we re-open; failures from
+            // requests that were admitted earlier don't count
+            CircuitState::HalfOpen => trial,
+            // Already open; late failures don't extend the pause
+            CircuitState::Open => false,
+        };
+        if trip {
+            log::warn!(
+                "Platform API {} circuit breaker is open after {} consecutive failures. \
+                 Pausing requests for {:?}",
+                self.name,
+                inner.fail_count,
+                self.reset_after
+            );
+            inner.state = CircuitState::Open;
+            inner.opened_at.replace(Instant::now());
+        }
+    }
+
+    /// The trial request was dropped before it produced an outcome.
+    /// Go back to open without restarting the reset period, so that
+    /// the next request becomes the new trial.
+    fn abandon_trial(&self) {
+        let mut inner = self.inner.lock();
+        if inner.state == CircuitState::HalfOpen {
+            log::debug!(
+                "Platform API {} circuit breaker trial request was abandoned",
+                self.name
+            );
+            inner.state = CircuitState::Open;
+        }
+    }
+}
+
+/// Permission from a CircuitBreaker to send a request.
+/// The outcome is reported by calling succeeded or failed.
+/// If the permit is dropped without doing either, for example because
+/// the request future was cancelled, a trial request is treated as
+/// abandoned so that the breaker doesn't stay half-open.
+#[must_use]
+struct CircuitPermit<'a> {
+    breaker: &'a CircuitBreaker,
+    trial: bool,
+    reported: bool,
+}
+
+impl<'a> CircuitPermit<'a> {
+    fn new(breaker: &'a CircuitBreaker, trial: bool) -> Self {
+        Self {
+            breaker,
+            trial,
+            reported: false,
+        }
+    }
+
+    fn succeeded(mut self) {
+        self.reported = true;
+        self.breaker.record_success();
+    }
+
+    fn failed(mut self) {
+        self.reported = true;
+        self.breaker.record_failure(self.trial);
+    }
+}
+
+impl Drop for CircuitPermit<'_> {
+    fn drop(&mut self) {
+        if self.trial && !self.reported {
+            self.breaker.abandon_trial();
+        }
+    }
+}
+
+#[derive(Error, Debug)]
+#[error("Platform API requests are paused after repeated failures; will retry in {retry_in:?}")]
+pub struct CircuitOpen {
+    retry_in: Duration,
+}
+
+impl CircuitOpen {
+    pub fn from_err(err: &anyhow::Error) -> Option<&Self> {
+        err.root_cause().downcast_ref::<Self>()
+    }
+}
+
+#[derive(Debug)]
+struct TokenBucketInner {
+    tokens: f64,
+    last_refill: Instant,
+}
+
+/// Limits the rate at which we send Platform API requests.
+/// Rather than spacing every request out evenly, requests go out
+/// as soon as a token is available, so that we make full use of
+/// the allowed budget, and only wait when it has been used up.
+#[derive(Debug)]
+pub struct TokenBucket {
+    capacity: f64,
+    refill_per_sec: f64,
+    inner: Mutex<TokenBucketInner>,
+}
+
+impl TokenBucket {
+    /// Create a bucket that allows `rate_per_min` requests per minute,
+    /// in bursts of up to that many requests.
+    /// A rate of 0 disables the limit.
+    pub fn per_minute(rate_per_min: u32) -> Self {
+        let capacity = rate_per_min as f64;
+        Self {
+            capacity,
+            refill_per_sec: capacity / 60.0,
+            inner: Mutex::new(TokenBucketInner {
+                tokens: capacity,
+                last_refill: Instant::now(),
+            }),
+        }
+    }
+
+    /// Takes a token if one is available, otherwise returns
+    /// how long it will be until the next one is
+    fn try_acquire(&self) -> Result<(), Duration> {
+        if self.capacity == 0.0 {
+            return Ok(());
+        }
+        let mut inner = self.inner.lock();
+        let now = Instant::now();
+        let elapsed = now.duration_since(inner.last_refill).as_secs_f64();
+        inner.tokens = (inner.tokens + elapsed * self.refill_per_sec).min(self.capacity);
+        inner.last_refill = now;
+
+        if inner.tokens >= 1.0 {
+            inner.tokens -= 1.0;
+            Ok(())
+        } else {
+            Err(Duration::from_secs_f64(
+                (1.0 - inner.tokens) / self.refill_per_sec,
+            ))
+        }
+    }
+
+    /// Waits until a token is available and takes it
+    pub async fn acquire(&self) {
+        while let Err(delay) = self.try_acquire() {
+            log::trace!("Platform API rate limit reached; waiting {delay:?}");
+            tokio::time::sleep(delay).await;
+        }
+    }
+}
+
+/// A connection pool paired with its own circuit breaker.
+/// Reads and controls each get one, so that a burst of commands,
+/// or the API throttling them, doesn't hold up state polling,
+/// and vice versa.
+#[derive(Clone)]
+struct Bulkhead {
+    client: reqwest::Client,
+    breaker: Arc<CircuitBreaker>,
+}
+
+impl Bulkhead {
+    fn new(pool: HttpPoolConfig, breaker: CircuitBreaker) -> anyhow::Result<Self> {
+        Ok(Self {
+            client: pool.build_client()?,
+            breaker: Arc::new(breaker),
+        })
     }
 }
 
 #[derive(Clone)]
 pub struct GoveeApiClient {
     key: String,
+    /// Used for device lists, state and scenes
+    reads: Bulkhead,
+    /// Used for device control
+    controls: Bulkhead,
+    /// The rate limit is per account, so it is shared by reads and controls
+    rate_limit: Arc<TokenBucket>,
 }
 
 impl GoveeApiClient {
-    pub fn new<K: Into<String>>(key: K) -> Self {
-        Self { key: key.into() }
+    pub fn new<K: Into<String>>(key: K, config: GoveeApiClientConfig) -> anyhow::Result<Self> {
+        let breaker =
+            |name| CircuitBreaker::new(name, config.breaker_threshold, config.breaker_reset);
+        Ok(Self {
+            key: key.into(),
+            reads: Bulkhead::new(config.read_pool, breaker("read"))?,
+            controls: Bulkhead::new(config.write_pool, breaker("control"))?,
+            rate_limit: Arc::new(TokenBucket::per_minute(config.rate_per_min)),
+        })
     }
 
     pub async fn get_devices(&self) -> anyhow::Result<Vec<HttpDeviceInfo>> {
@@ -119,7 +601,7 @@ impl GoveeApiClient {
         };
 
         let resp: ControlDeviceResponse = self
-            .request_with_json_response(Method::POST, url, &request)
+            .request_with_json_response(&self.controls, Method::POST, url, &request)
             .await?;
 
         log::info!("control_device result: {resp:?}");
@@ -141,7 +623,7 @@ impl GoveeApiClient {
         };
 
         let resp: GetDeviceStateResponse = self
-            .request_with_json_response(Method::POST, url, &request)
+            .request_with_json_response(&self.reads, Method::POST, url, &request)
             .await?;
 
         Ok(resp.payload)
@@ -176,7 +658,7 @@ impl GoveeApiClient {
                 };
 
                 let resp: GetDeviceScenesResponse = self
-                    .request_with_json_response(Method::POST, url, &request)
+                    .request_with_json_response(&self.reads, Method::POST, url, &request)
                     .await?;
 
                 Ok(CacheComputeResult::Value(resp.payload.capabilities))
@@ -214,7 +696,7 @@ impl GoveeApiClient {
                 };
 
                 let resp: GetDeviceScenesResponse = self
-                    .request_with_json_response(Method::POST, url, &request)
+                    .request_with_json_response(&self.reads, Method::POST, url, &request)
                     .await?;
 
                 Ok(CacheComputeResult::Value(resp.payload.capabilities))
@@ -707,34 +1189,8 @@ impl HttpDeviceInfo {
 
     /// If supported, returns the number of segments
     pub fn supports_segmented_rgb(&self) -> Option<std::ops::Range<u32>> {
-        let cap = self.capability_by_instance("segmentedColorRgb")?;
-        let field = cap.struct_field_by_name("segment")?;
-        match field.field_type {
-            DeviceParameters::Array {
-                size:
-                    Some(ArraySize {
-                        // These are the display indices. eg: 1-based
-                        min: label_min,
-                        max: label_max,
-                    }),
-                element_range:
-                    Some(ElementRange {
-                        // These are the actual indices. eg: 0-based
-                        min: range_min,
-                        // We ignore the max here, because the data
-                        // reported by Govee can be bogus:
-                        // <https://developer.govee.com/discuss/6599afb91cb48d002dbed2b8>
-                        max: _,
-                    }),
-                ..
-            } => {
-                // This range is an inclusive range, so add 1
-                let num_segments = (1 + label_max).saturating_sub(label_min);
-                // Return our exclusive range
-                Some(range_min..range_min + num_segments)
-            }
-            _ => None,
-        }
+        self.capability_by_instance("segmentedColorRgb")?
+            .segmented_rgb_range()
     }
 
     pub fn supports_segmented_brightness(&self) -> Option<(u32, u32)> {
@@ -864,6 +1320,38 @@ pub struct DeviceCapability {
 }
 
 impl DeviceCapability {
+    /// For the segmentedColorRgb capability, returns the range
+    /// of segment indices
+    pub fn segmented_rgb_range(&self) -> Option<std::ops::Range<u32>> {
+        let field = self.struct_field_by_name("segment")?;
+        match field.field_type {
+            DeviceParameters::Array {
+                size:
+                    Some(ArraySize {
+                        // These are the display indices. eg: 1-based
+                        min: label_min,
+                        max: label_max,
+                    }),
+                element_range:
+                    Some(ElementRange {
+                        // These are the actual indices. eg: 0-based
+                        min: range_min,
+                        // We ignore the max here, because the data
+                        // reported by Govee can be bogus:
+                        // <https://developer.govee.com/discuss/6599afb91cb48d002dbed2b8>
+                        max: _,
+                    }),
+                ..
+            } => {
+                // This range is an inclusive range, so add 1
+                let num_segments = (1 + label_max).saturating_sub(label_min);
+                // Return our exclusive range
+                Some(range_min..range_min + num_segments)
+            }
+            _ => None,
+        }
+    }
+
     pub fn enum_parameter_by_name(&self, name: &str) -> Option<u32> {
         self.parameters
             .as_ref()
@@ -972,6 +1460,13 @@ pub struct ArrayOption {
 
 pub fn from_json<T: serde::de::DeserializeOwned, S: AsRef<[u8]>>(text: S) -> anyhow::Result<T> {
     let text = text.as_ref();
+    // Plain serde_json is faster than serde_json_path_to_error because
+    // it doesn't need to track the path as it goes, so use it for the
+    // common case, and only re-parse with path tracking to produce a
+    // more helpful error message when something goes wrong.
+    if let Ok(value) = serde_json::from_slice(text) {
+        return Ok(value);
+    }
     serde_json_path_to_error::from_slice(text).map_err(|err| {
         anyhow::anyhow!(
             "{} {err}. Input: {}",
@@ -1012,7 +1507,9 @@ pub async fn json_body<T: serde::de::DeserializeOwned>(
         .await
         .with_context(|| format!("read {url} response body"))?;
 
-    if let Ok(status) = from_json::<EmbeddedRequestStatus, _>(&data) {
+    // This is just a probe; most responses don't embed a failure status,
+    // so don't pay for a detailed error message when it doesn't match
+    if let Ok(status) = serde_json::from_slice::<EmbeddedRequestStatus>(&data) {
         if status.status != reqwest::StatusCode::OK.as_u16() {
             if let Ok(code) = reqwest::StatusCode::from_u16(status.status) {
                 return Err(HttpRequestFailed {
@@ -1069,18 +1566,130 @@ pub async fn http_response_body<R: serde::de::DeserializeOwned>(
     })
 }
 
+fn should_retry(status: StatusCode) -> bool {
+    status == StatusCode::TOO_MANY_REQUESTS || status.is_server_error()
+}
+
+/// Computes the delay before the next retry using the
+/// "decorrelated jitter" strategy described in
+/// <https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/>.
+/// Randomizing the delay avoids having multiple callers that were
+/// throttled at the same time all retry in lock-step.
+fn decorrelated_jitter(prev_delay: Duration) -> Duration {
+    let base = RETRY_BASE_DELAY.as_secs_f64();
+    let upper = prev_delay.as_secs_f64().max(base) * 3.0;
+    let secs = rand::thread_rng().gen_range(base..=upper);
+    Duration::from_secs_f64(secs).min(RETRY_MAX_DELAY)
+}
+
+/// Parses the Retry-After header, which may be expressed either
+/// as a number of seconds or as an HTTP date.
+fn retry_after(response: &reqwest::Response) -> Option<Duration> {
+    let value = response
+        .headers()
+        .get(reqwest::header::RETRY_AFTER)?
+        .to_str()
+        .ok()?;
+    parse_retry_after(value)
+}
+
+fn parse_retry_after(value: &str) -> Option<Duration> {
+    let value = value.trim();
+
+    if let Ok(secs) = value.parse::<f64>() {
+        // Rejects negative, non-finite and out of range values
+        return Duration::try_from_secs_f64(secs).ok();
+    }
+
+    let when = chrono::DateTime::parse_from_rfc2822(value).ok()?;
+    Some(
+        (when.with_timezone(&Utc) - Utc::now())
+            .to_std()
+            .unwrap_or(Duration::ZERO),
+    )
+}
+
 impl GoveeApiClient {
+    /// Sends the request, retrying with backoff if the server
+    /// throttles us or reports a transient error
+    async fn send_with_retry(
+        &self,
+        bulkhead: &Bulkhead,
+        request: reqwest::RequestBuilder,
+    ) -> anyhow::Result<reqwest::Response> {
+        let permit = bulkhead.breaker.check()?;
+
+        let mut prev_delay = RETRY_BASE_DELAY;
+        let mut attempt = 0;
+        loop {
+            self.rate_limit.acquire().await;
+
+            let response = match request
+                .try_clone()
+                .ok_or_else(|| anyhow::anyhow!("request cannot be retried"))?
+                .send()
+                .await
+            {
+                Ok(response) => response,
+                Err(err) => {
+                    permit.failed();
+                    return Err(err.into());
+                }
+            };
+
+            let status = response.status();
+            let delay = if should_retry(status) && attempt < MAX_RETRIES {
+                match retry_after(&response) {
+                    Some(delay) if delay > RETRY_MAX_DELAY => {
+                        // The caller may be holding the device or poll
+                        // permits, so don't stall it for that long;
+                        // report the failure now instead
+                        log::warn!(
+                            "request {url} status {status}, server asked us to \
+                             retry in {delay:?}, which is longer than we will wait",
+                            url = response.url()
+                        );
+                        None
+                    }
+                    Some(delay) => Some(delay),
+                    None => {
+                        prev_delay = decorrelated_jitter(prev_delay);
+                        Some(prev_delay)
+                    }
+                }
+            } else {
+                None
+            };
+
+            let Some(delay) = delay else {
+                if status.is_server_error() {
+                    permit.failed();
+                } else {
+                    permit.succeeded();
+                }
+                return Ok(response);
+            };
+            attempt += 1;
+
+            log::warn!(
+                "request {url} status {status}, will retry in {delay:?} \
+                 (attempt {attempt} of {MAX_RETRIES})",
+                url = response.url()
+            );
+            tokio::time::sleep(delay).await;
+        }
+    }
+
     async fn get_request_with_json_response<T: reqwest::IntoUrl, R: serde::de::DeserializeOwned>(
         &self,
         url: T,
     ) -> anyhow::Result<R> {
-        let response = reqwest::Client::builder()
-            .timeout(Duration::from_secs(60))
-            .build()?
+        let request = self
+            .reads
+            .client
             .request(Method::GET, url)
-            .header("Govee-API-Key", &self.key)
-            .send()
-            .await?;
+            .header("Govee-API-Key", &self.key);
+        let response = self.send_with_retry(&self.reads, request).await?;
 
         http_response_body(response).await
     }
@@ -1091,18 +1700,17 @@ impl GoveeApiClient {
         R: serde::de::DeserializeOwned,
     >(
         &self,
+        bulkhead: &Bulkhead,
         method: Method,
         url: T,
         body: &B,
     ) -> anyhow::Result<R> {
-        let response = reqwest::Client::builder()
-            .timeout(Duration::from_secs(60))
-            .build()?
+        let request = bulkhead
+            .client
             .request(method, url)
             .header("Govee-API-Key", &self.key)
-            .json(body)
-            .send()
-            .await?;
+            .json(body);
+        let response = self.send_with_retry(bulkhead, request).await?;
 
         http_response_body(response).await
     }
@@ -1150,6 +1758,129 @@ mod test {
         k9::assert_matches_snapshot!(format!("{resp:#?}"));
     }
 
+    #[test]
+    fn retry_delay_is_bounded() {
+        let mut delay = RETRY_BASE_DELAY;
+        for _ in 0..20 {
+            let next = decorrelated_jitter(delay);
+            assert!(next >= RETRY_BASE_DELAY, "{next:?} too small");
+            assert!(next <= RETRY_MAX_DELAY, "{next:?} too large");
+            assert!(next.as_secs_f64() <= delay.as_secs_f64() * 3.0);
+            delay = next;
+        }
+    }
+
+    #[test]
+    fn circuit_breaker_opens_and_closes() {
+        let breaker = CircuitBreaker::new("test", 2, Duration::from_secs(3600));
+        breaker.check().unwrap().failed();
+        breaker.check().unwrap().failed();
+        assert_eq!(breaker.inner.lock().state, CircuitState::Open);
+        assert!(breaker.check().is_err());
+
+        // A success resets the count
+        let breaker = CircuitBreaker::new("test", 2, Duration::from_secs(3600));
+        breaker.check().unwrap().failed();
+        breaker.check().unwrap().succeeded();
+        breaker.check().unwrap().failed();
+        assert_eq!(breaker.inner.lock().state, CircuitState::Closed);
+    }
+
+    #[test]
+    fn circuit_breaker_half_open() {
+        let breaker = CircuitBreaker::new("test", 1, Duration::ZERO);
+        breaker.check().unwrap().failed();
+        assert_eq!(breaker.inner.lock().state, CircuitState::Open);
+
+        // Reset period has elapsed, so a single trial is allowed
+        let trial = breaker.check().unwrap();
+        assert_eq!(breaker.inner.lock().state, CircuitState::HalfOpen);
+        assert!(breaker.check().is_err());
+
+        // and if the trial fails, we go back to open
+        trial.failed();
+        assert_eq!(breaker.inner.lock().state, CircuitState::Open);
+
+        // or if it succeeds, we close again
+        breaker.check().unwrap().succeeded();
+        assert_eq!(breaker.inner.lock().state, CircuitState::Closed);
+    }
+
+    #[test]
+    fn circuit_breaker_late_failures() {
+        let breaker = CircuitBreaker::new("test", 1, Duration::from_secs(3600));
+        let early = breaker.check().unwrap();
+        breaker.check().unwrap().failed();
+        let opened_at = breaker.inner.lock().opened_at;
+        assert!(opened_at.is_some());
+
+        // A request admitted before the breaker opened fails later;
+        // that must not extend the pause
+        early.failed();
+        assert_eq!(breaker.inner.lock().state, CircuitState::Open);
+        assert_eq!(breaker.inner.lock().opened_at, opened_at);
+    }
+
+    #[test]
+    fn circuit_breaker_abandoned_trial() {
+        let breaker = CircuitBreaker::new("test", 1, Duration::ZERO);
+        breaker.check().unwrap().failed();
+
+        // The trial is dropped without reporting an outcome,
+        // as happens when the request future is cancelled
+        drop(breaker.check().unwrap());
+        assert_eq!(breaker.inner.lock().state, CircuitState::Open);
+
+        // so the next request becomes the new trial
+        breaker.check().unwrap().succeeded();
+        assert_eq!(breaker.inner.lock().state, CircuitState::Closed);
+
+        // Dropping an ordinary permit doesn't change anything
+        drop(breaker.check().unwrap());
+        assert_eq!(breaker.inner.lock().state, CircuitState::Closed);
+    }
+
+    #[test]
+    fn circuit_breaker_disabled() {
+        let breaker = CircuitBreaker::new("test", 0, Duration::from_secs(3600));
+        for _ in 0..100 {
+            breaker.check().unwrap().failed();
+        }
+        assert_eq!(breaker.inner.lock().state, CircuitState::Closed);
+    }
+
+    #[test]
+    fn token_bucket() {
+        let bucket = TokenBucket::per_minute(6);
+        for _ in 0..6 {
+            assert!(bucket.try_acquire().is_ok());
+        }
+        let delay = bucket.try_acquire().unwrap_err();
+        assert!(delay > Duration::from_secs(9), "{delay:?} too small");
+        assert!(delay <= Duration::from_secs(10), "{delay:?} too large");
+
+        let unlimited = TokenBucket::per_minute(0);
+        for _ in 0..100 {
+            assert!(unlimited.try_acquire().is_ok());
+        }
+    }
+
+    #[test]
+    fn retry_after_values() {
+        assert_eq!(parse_retry_after("5"), Some(Duration::from_secs(5)));
+        assert_eq!(
+            parse_retry_after(" 1.5 "),
+            Some(Duration::from_millis(1500))
+        );
+        assert_eq!(parse_retry_after("-1"), None);
+        assert_eq!(parse_retry_after("1e30"), None);
+        assert_eq!(parse_retry_after("bogus"), None);
+        assert_eq!(
+            parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"),
+            Some(Duration::ZERO)
+        );
+    }
+
     #[test]
     fn enum_repr() {
         k9::assert_equal!(
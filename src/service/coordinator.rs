@@ -1,5 +1,5 @@
 use crate::service::device::Device;
-use tokio::sync::oneshot::Sender as OneShotSender;
+use tokio::sync::mpsc::UnboundedSender;
 use tokio::sync::OwnedSemaphorePermit;
 
 /// The Coordinator ensures that only one task at a time can
@@ -17,20 +17,21 @@ use tokio::sync::OwnedSemaphorePermit;
 pub struct Coordinator {
     device: Device,
 
-    // These fields are not unused; we are keeping them
-    // alive until we drop at which point they release
-    // resources and/or trigger follow up work in other tasks.
+    // This field is not unused; we are keeping it
+    // alive until we drop at which point it releases
+    // the control lock for the device.
     #[allow(unused)]
     permit: OwnedSemaphorePermit,
-    #[allow(unused)]
-    trigger_poll: OneShotSender<()>,
+    /// Used to ask for the device to be polled once
+    /// we are done controlling it
+    trigger_poll: UnboundedSender<String>,
 }
 
 impl Coordinator {
     pub fn new(
         device: Device,
         permit: OwnedSemaphorePermit,
-        trigger_poll: OneShotSender<()>,
+        trigger_poll: UnboundedSender<String>,
     ) -> Self {
         Self {
             device,
@@ -40,6 +41,13 @@ impl Coordinator {
     }
 }
 
+impl Drop for Coordinator {
+    fn drop(&mut self) {
+        // Schedule a poll to reconcile any changed state
+        self.trigger_poll.send(self.device.id.clone()).ok();
+    }
+}
+
 impl std::ops::Deref for Coordinator {
     type Target = Device;
 
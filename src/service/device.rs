@@ -10,12 +10,28 @@ use serde::{Deserialize, Serialize};
 use std::borrow::Cow;
 use std::collections::HashMap;
 use std::net::IpAddr;
+use std::sync::Arc;
+use uncased::{Uncased, UncasedStr};
 
+/// Device is cloned out of the State each time it is looked up, so the
+/// bulky and rarely-changing API payloads are held behind an Arc to
+/// make those clones cheap.
 #[derive(Default, Clone, Debug)]
 pub struct Device {
     pub sku: String,
     pub id: String,
 
+    /// The id with characters that are problematic in mqtt topics
+    /// removed. It is used to build every topic and unique_id for
+    /// this device, so we compute it once up front.
+    topic_id: String,
+
+    /// The quirk for this device, resolved from the sku and whether we
+    /// have seen it on the LAN. It is consulted by most of the supports_XXX
+    /// methods, so we resolve it when those facts change rather than on
+    /// every call.
+    quirk: Option<Cow<'static, Quirk>>,
+
     /// Probed LAN device information, found either via discovery
     /// or explicit probing by IP address
     pub lan_device: Option<LanDevice>,
@@ -24,13 +40,13 @@ pub struct Device {
     pub lan_device_status: Option<LanDeviceStatus>,
     pub last_lan_device_status_update: Option<DateTime<Utc>>,
 
-    pub http_device_info: Option<HttpDeviceInfo>,
+    http_device_info: Option<Arc<Indexed<HttpDeviceInfo>>>,
     pub last_http_device_update: Option<DateTime<Utc>>,
 
-    pub http_device_state: Option<HttpDeviceState>,
+    http_device_state: Option<Arc<Indexed<HttpDeviceState>>>,
     pub last_http_device_state_update: Option<DateTime<Utc>>,
 
-    pub undoc_device_info: Option<UndocDeviceInfo>,
+    pub undoc_device_info: Option<Arc<UndocDeviceInfo>>,
     pub last_undoc_device_info_update: Option<DateTime<Utc>>,
 
     pub iot_device_status: Option<LanDeviceStatus>,
@@ -91,6 +107,23 @@ pub struct DeviceState {
     pub updated: DateTime<Utc>,
 }
 
+/// A Platform API payload together with an index that maps each
+/// capability instance name to its position in the payload's
+/// capability list. They live together behind the Arc in Device
+/// so that the index is shared by clones, and can't get out of
+/// step with the payload it describes.
+#[derive(Debug)]
+struct Indexed<T> {
+    payload: T,
+    index: HashMap<Uncased<'static>, usize>,
+}
+
+impl<T> Indexed<T> {
+    fn position(&self, instance: &str) -> Option<usize> {
+        self.index.get(UncasedStr::new(instance)).copied()
+    }
+}
+
 #[derive(Debug, Clone)]
 pub struct UndocDeviceInfo {
     pub room_name: Option<String>,
@@ -102,11 +135,21 @@ impl Device {
     /// No other facts are known or reflected by it at this time;
     /// they will need to be added by the caller.
     pub fn new<S: Into<String>, I: Into<String>>(sku: S, id: I) -> Self {
-        Self {
+        let id = id.into();
+        let topic_id = id.chars().filter(|&c| c != ':' && c != ' ').collect();
+        let mut device = Self {
             sku: sku.into(),
-            id: id.into(),
+            id,
+            topic_id,
             ..Self::default()
-        }
+        };
+        device.quirk = device.compute_quirk();
+        device
+    }
+
+    /// Returns the id in a form that is safe to use in mqtt topics
+    pub fn topic_id(&self) -> &str {
+        &self.topic_id
     }
 
     /// Returns the device name; either the name defined in the Govee App,
@@ -124,7 +167,7 @@ impl Device {
 
     /// Returns the name defined for the device in the Govee App
     pub fn govee_name(&self) -> Option<&str> {
-        if let Some(info) = &self.http_device_info {
+        if let Some(info) = self.http_device_info() {
             return Some(&info.device_name);
         }
         None
@@ -194,6 +237,7 @@ impl Device {
     pub fn set_lan_device(&mut self, device: LanDevice) {
         self.lan_device.replace(device);
         self.last_lan_device_update.replace(Utc::now());
+        self.quirk = self.compute_quirk();
     }
 
     /// Update the LAN device status information
@@ -216,12 +260,20 @@ impl Device {
     }
 
     pub fn set_http_device_info(&mut self, info: HttpDeviceInfo) {
-        self.http_device_info.replace(info);
+        let index = index_by_instance(info.capabilities.iter().map(|c| c.instance.as_str()));
+        self.http_device_info.replace(Arc::new(Indexed {
+            payload: info,
+            index,
+        }));
         self.last_http_device_update.replace(Utc::now());
     }
 
     pub fn set_http_device_state(&mut self, state: HttpDeviceState) {
-        self.http_device_state.replace(state);
+        let index = index_by_instance(state.capabilities.iter().map(|c| c.instance.as_str()));
+        self.http_device_state.replace(Arc::new(Indexed {
+            payload: state,
+            index,
+        }));
         self.last_http_device_state_update.replace(Utc::now());
         self.clear_scene_if_color_changed();
     }
@@ -231,10 +283,10 @@ impl Device {
         entry: crate::undoc_api::DeviceEntry,
         room_name: Option<&str>,
     ) {
-        self.undoc_device_info.replace(UndocDeviceInfo {
+        self.undoc_device_info.replace(Arc::new(UndocDeviceInfo {
             entry,
             room_name: room_name.map(|s| s.to_string()),
-        });
+        }));
         self.last_undoc_device_info_update.replace(Utc::now());
         self.clear_scene_if_color_changed();
     }
@@ -279,7 +331,7 @@ impl Device {
 
     pub fn compute_http_device_state(&self) -> Option<DeviceState> {
         let updated = self.last_http_device_state_update?;
-        let state = self.http_device_state.as_ref()?;
+        let state = self.http_device_state()?;
 
         let mut online = None;
         let mut on = false;
@@ -300,7 +352,7 @@ impl Device {
         let light_instance = self.get_light_power_toggle_instance_name();
 
         for cap in &state.capabilities {
-            if let Ok(value) = serde_json::from_value::<IntegerValueState>(cap.state.clone()) {
+            if let Ok(value) = IntegerValueState::deserialize(&cap.state) {
                 if light_instance
                     .as_deref()
                     .map(|inst| inst == cap.instance.as_str())
@@ -329,7 +381,7 @@ impl Device {
                     _ => {}
                 }
             } else if cap.instance == "online" {
-                if let Ok(value) = serde_json::from_value::<BoolValueState>(cap.state.clone()) {
+                if let Ok(value) = BoolValueState::deserialize(&cap.state) {
                     online.replace(value.value);
                 }
             }
@@ -404,9 +456,9 @@ impl Device {
     }
 
     pub fn device_type(&self) -> DeviceType {
-        if let Some(info) = &self.http_device_info {
+        if let Some(info) = self.http_device_info() {
             info.device_type.clone()
-        } else if let Some(q) = resolve_quirk(&self.sku) {
+        } else if let Some(q) = self.resolve_quirk() {
             q.device_type.clone()
         } else {
             DeviceType::Light
@@ -451,13 +503,7 @@ impl Device {
             if quirk.avoid_platform_api {
                 return true;
             }
-            if self.lan_device.is_some()
-                && !self
-                    .http_device_info
-                    .as_ref()
-                    .map(|info| info.supports_rgb())
-                    .unwrap_or(false)
-            {
+            if self.lan_device.is_some() && self.get_capability_by_instance("colorRgb").is_none() {
                 // Conflicting information:
                 // Platform API says that this device isn't
                 // a light, but the LAN API support suggests
@@ -469,14 +515,20 @@ impl Device {
         false
     }
 
-    pub fn resolve_quirk(&self) -> Option<Quirk> {
+    pub fn resolve_quirk(&self) -> Option<&Quirk> {
+        self.quirk.as_deref()
+    }
+
+    fn compute_quirk(&self) -> Option<Cow<'static, Quirk>> {
         match resolve_quirk(&self.sku) {
-            Some(q) => Some(q.clone()),
+            Some(q) => Some(Cow::Borrowed(q)),
             None => {
                 // It's an unknown device, but since it showed up via LAN disco,
                 // we can assume that it is a light
                 if self.lan_device.is_some() {
-                    Some(Quirk::light(Cow::Owned(self.sku.to_string()), BULB).with_lan_api())
+                    Some(Cow::Owned(
+                        Quirk::light(Cow::Owned(self.sku.to_string()), BULB).with_lan_api(),
+                    ))
                 } else {
                     None
                 }
@@ -484,19 +536,32 @@ impl Device {
         }
     }
 
+    /// Returns the device metadata from the Platform API, if known
+    pub fn http_device_info(&self) -> Option<&HttpDeviceInfo> {
+        self.http_device_info.as_ref().map(|info| &info.payload)
+    }
+
+    /// Returns the most recent device state from the Platform API, if known
+    pub fn http_device_state(&self) -> Option<&HttpDeviceState> {
+        self.http_device_state.as_ref().map(|state| &state.payload)
+    }
+
     pub fn get_capability_by_instance(&self, instance: &str) -> Option<&DeviceCapability> {
-        self.http_device_info
-            .as_ref()
-            .and_then(|info| info.capability_by_instance(instance))
+        let info = self.http_device_info.as_ref()?;
+        info.payload.capabilities.get(info.position(instance)?)
+    }
+
+    pub fn supports_segmented_rgb(&self) -> Option<std::ops::Range<u32>> {
+        self.get_capability_by_instance("segmentedColorRgb")?
+            .segmented_rgb_range()
     }
 
     pub fn get_state_capability_by_instance(
         &self,
         instance: &str,
     ) -> Option<&DeviceCapabilityState> {
-        self.http_device_state
-            .as_ref()
-            .and_then(|info| info.capability_by_instance(instance))
+        let state = self.http_device_state.as_ref()?;
+        state.payload.capabilities.get(state.position(instance)?)
     }
 
     pub fn get_light_power_toggle_instance_name(&self) -> Option<&'static str> {
@@ -531,8 +596,7 @@ impl Device {
             return Some((2000, 9000));
         }
 
-        self.http_device_info
-            .as_ref()
+        self.http_device_info()
             .and_then(|info| info.get_color_temperature_range())
     }
 
@@ -546,10 +610,7 @@ impl Device {
             return true;
         }
 
-        self.http_device_info
-            .as_ref()
-            .map(|info| info.supports_brightness())
-            .unwrap_or(false)
+        self.get_capability_by_instance("brightness").is_some()
     }
 
     pub fn iot_api_supported(&self) -> bool {
@@ -570,10 +631,7 @@ impl Device {
             return true;
         }
 
-        self.http_device_info
-            .as_ref()
-            .map(|info| info.supports_rgb())
-            .unwrap_or(false)
+        self.get_capability_by_instance("colorRgb").is_some()
     }
 
     pub fn is_ble_only_device(&self) -> Option<bool> {
@@ -603,6 +661,21 @@ impl Device {
     }
 }
 
+/// Builds a case-insensitive index from capability instance name to
+/// its position in the capability list. If an instance name appears
+/// more than once, the first one wins, matching a linear search.
+fn index_by_instance<'a>(
+    instances: impl Iterator<Item = &'a str>,
+) -> HashMap<Uncased<'static>, usize> {
+    let mut index = HashMap::new();
+    for (idx, instance) in instances.enumerate() {
+        index
+            .entry(Uncased::new(instance.to_string()))
+            .or_insert(idx);
+    }
+    index
+}
+
 #[cfg(test)]
 mod test {
     use super::*;
@@ -618,4 +691,49 @@ mod test {
         let device = Device::new("H6127", "ce");
         assert_eq!(device.name(), "H6127_CE");
     }
+
+    #[test]
+    fn capability_index() {
+        let resp: serde_json::Value =
+            serde_json::from_str(include_str!("../../test-data/list_devices.json")).unwrap();
+        let info: HttpDeviceInfo = serde_json::from_value(resp["data"][0].clone()).unwrap();
+        let mut device = Device::new(info.sku.clone(), info.device.clone());
+        device.set_http_device_info(info.clone());
+
+        for cap in &info.capabilities {
+            let found = device
+                .get_capability_by_instance(&cap.instance.to_ascii_uppercase())
+                .map(|c| c.instance.as_str());
+            assert_eq!(found, Some(cap.instance.as_str()));
+        }
+        assert!(device.get_capability_by_instance("bogus").is_none());
+    }
+
+    #[test]
+    fn quirk_follows_lan_device() {
+        let mut device = Device::new("H9999", "AA:BB:CC:DD:EE:FF:42:2A");
+        assert!(device.resolve_quirk().is_none());
+
+        device.set_lan_device(LanDevice {
+            ip: "10.0.0.2".parse().unwrap(),
+            device: device.id.clone(),
+            sku: device.sku.clone(),
+            ble_version_hard: String::new(),
+            ble_version_soft: String::new(),
+            wifi_version_hard: String::new(),
+            wifi_version_soft: String::new(),
+        });
+        let quirk = device.resolve_quirk().expect("LAN devices are lights");
+        assert!(quirk.lan_api_capable);
+        assert!(device.supports_rgb());
+    }
+
+    #[test]
+    fn topic_id() {
+        let device = Device::new("H6000", "AA:BB:CC:DD:EE:FF:42:2A");
+        assert_eq!(device.topic_id(), "AABBCCDDEEFF422A");
+
+        let device = Device::new("H6127", "cef142b0b354995f");
+        assert_eq!(device.topic_id(), "cef142b0b354995f");
+    }
 }
@@ -157,8 +157,8 @@ impl HassClient {
         topic: T,
         payload: P,
     ) -> anyhow::Result<()> {
-        let payload = serde_json::to_string(&payload)?;
-        log::trace!("{topic} -> {payload}");
+        let payload = serde_json::to_vec(&payload)?;
+        log::trace!("{topic} -> {}", String::from_utf8_lossy(&payload));
         self.client
             .publish(topic, payload, QoS::AtMostOnce, false)
             .await?;
@@ -190,11 +190,8 @@ pub fn topic_safe_string(s: &str) -> String {
     result
 }
 
-pub fn topic_safe_id(device: &ServiceDevice) -> String {
-    let mut id = device.id.to_string();
-    id.retain(|c| c != ':');
-    id.retain(|c| c != ' ');
-    id
+pub fn topic_safe_id(device: &ServiceDevice) -> &str {
+    device.topic_id()
 }
 
 pub fn switch_instance_state_topic(device: &ServiceDevice, instance: &str) -> String {
@@ -360,8 +357,7 @@ async fn mqtt_light_segment_command(
 
     if let Some(client) = state.get_platform_client().await {
         let info = device
-            .http_device_info
-            .as_ref()
+            .http_device_info()
             .ok_or_else(|| anyhow::anyhow!("HTTP device info is missing"))?;
 
         log::info!("Using Platform API to control {device} segment");
@@ -451,7 +447,7 @@ async fn mqtt_switch_command(
     if instance == "powerSwitch" {
         state.device_power_on(&device, on).await?;
     } else if let Some(client) = state.get_platform_client().await {
-        if let Some(http_dev) = &device.http_device_info {
+        if let Some(http_dev) = device.http_device_info() {
             client.set_toggle_state(http_dev, &instance, on).await?;
         } else {
             anyhow::bail!("No platform state available to set {id} {instance} to {on}");
@@ -1,6 +1,6 @@
 use crate::ble::{Base64HexBytes, SetHumidifierMode, SetHumidifierNightlightParams};
 use crate::lan_api::{Client as LanClient, DeviceStatus as LanDeviceStatus, LanDevice};
-use crate::platform_api::{DeviceCapability, GoveeApiClient};
+use crate::platform_api::{CircuitOpen, DeviceCapability, GoveeApiClient};
 use crate::service::coordinator::Coordinator;
 use crate::service::device::Device;
 use crate::service::hass::{topic_safe_id, HassClient};
@@ -10,10 +10,17 @@ use crate::undoc_api::GoveeUndocumentedApi;
 use anyhow::Context;
 use serde_json::Value as JsonValue;
 use std::collections::HashMap;
+use std::net::IpAddr;
 use std::sync::Arc;
 use std::time::Instant;
+use tokio::sync::mpsc::{unbounded_channel, UnboundedReceiver, UnboundedSender};
 use tokio::sync::{MappedMutexGuard, Mutex, MutexGuard, Semaphore};
-use tokio::time::{sleep, Duration};
+use tokio::time::{sleep, sleep_until, Duration};
+
+/// How long to wait after controlling a device before polling it.
+/// The status returned by the platform API isn't guaranteed to be
+/// coherent with the command we just issued right away :-/
+const POLL_AFTER_CONTROL_DELAY: Duration = Duration::from_secs(5);
 
 #[derive(Default)]
 pub struct State {
@@ -26,6 +33,7 @@ pub struct State {
     hass_client: Mutex<Option<HassClient>>,
     hass_discovery_prefix: Mutex<String>,
     temperature_scale: Mutex<TemperatureScale>,
+    poll_after_control_tx: Mutex<Option<UnboundedSender<String>>>,
 }
 
 pub type StateHandle = Arc<State>;
@@ -103,21 +111,62 @@ impl State {
             .ok_or_else(|| anyhow::anyhow!("device '{label}' not found"))?;
         let semaphore = self.semaphore_for_device(&device).await;
         let permit = semaphore.acquire_owned().await?;
-        let (tx, rx) = tokio::sync::oneshot::channel();
-
-        // Schedule a task that will poll the device a short
-        // time after the Coordinator is dropped, to reconcile
-        // any changed state
-        let state = self.clone();
-        let device_id = device.id.to_string();
-        tokio::spawn(async move {
-            let _ = rx.await;
-            state.poll_after_control(device_id).await
-        });
+
+        // The Coordinator will ask for the device to be polled
+        // a short time after it is dropped, to reconcile any
+        // changed state
+        let tx = self.poll_after_control_sender().await;
 
         Ok(Coordinator::new(device, permit, tx))
     }
 
+    /// Returns the channel used to request a poll after control,
+    /// starting the task that services it if necessary
+    async fn poll_after_control_sender(self: &Arc<Self>) -> UnboundedSender<String> {
+        let mut tx = self.poll_after_control_tx.lock().await;
+        tx.get_or_insert_with(|| {
+            let (tx, rx) = unbounded_channel();
+            let state = self.clone();
+            tokio::spawn(async move { state.run_poll_after_control(rx).await });
+            tx
+        })
+        .clone()
+    }
+
+    /// A single long-lived task that waits for devices to be
+    /// controlled and polls them after POLL_AFTER_CONTROL_DELAY.
+    /// If a device is controlled again before its poll is due,
+    /// the poll is pushed back rather than queueing another one,
+    /// so a burst of commands results in a single poll.
+    async fn run_poll_after_control(self: Arc<Self>, mut rx: UnboundedReceiver<String>) {
+        let mut pending: HashMap<String, tokio::time::Instant> = HashMap::new();
+        loop {
+            let next_due = pending.values().min().copied();
+            tokio::select! {
+                id = rx.recv() => {
+                    let Some(id) = id else {
+                        break;
+                    };
+                    pending.insert(id, tokio::time::Instant::now() + POLL_AFTER_CONTROL_DELAY);
+                }
+                _ = sleep_until(next_due.unwrap_or_else(tokio::time::Instant::now)),
+                    if next_due.is_some() => {
+                    let now = tokio::time::Instant::now();
+                    let due: Vec<String> = pending
+                        .iter()
+                        .filter(|(_, when)| **when <= now)
+                        .map(|(id, _)| id.clone())
+                        .collect();
+                    for id in due {
+                        pending.remove(&id);
+                        let state = self.clone();
+                        tokio::spawn(async move { state.poll_after_control(id).await });
+                    }
+                }
+            }
+        }
+    }
+
     /// Resolve a device using its name, computed name, id or label,
     /// ignoring case.
     pub async fn resolve_device(&self, label: &str) -> Option<Device> {
@@ -128,15 +177,12 @@ impl State {
             return Some(device.clone());
         }
 
+        // This runs for every inbound mqtt command, so parse the
+        // label as an address once rather than per device
+        let ip: Option<IpAddr> = label.parse().ok();
+
         for d in devices.values() {
-            if d.name().eq_ignore_ascii_case(label)
-                || d.id.eq_ignore_ascii_case(label)
-                || topic_safe_id(d).eq_ignore_ascii_case(label)
-                || d.ip_addr()
-                    .map(|ip| ip.to_string().eq_ignore_ascii_case(label))
-                    .unwrap_or(false)
-                || d.computed_name().eq_ignore_ascii_case(label)
-            {
+            if device_matches_label(d, label, ip) {
                 return Some(d.clone());
             }
         }
@@ -221,11 +267,17 @@ impl State {
         if let Some(client) = self.get_platform_client().await {
             let device_state = device.device_state();
             log::info!("requesting update via Platform API {device} {device_state:?}");
-            if let Some(info) = &device.http_device_info {
-                let http_state = client
-                    .get_device_state(info)
-                    .await
-                    .context("get_device_state")?;
+            if let Some(info) = device.http_device_info() {
+                let http_state = match client.get_device_state(info).await {
+                    Ok(state) => state,
+                    Err(err) if CircuitOpen::from_err(&err).is_some() => {
+                        // The Platform API is unhealthy; keep reporting
+                        // the last known state rather than an error
+                        log::debug!("{err:#}. Keeping last known state for {device}");
+                        return Ok(false);
+                    }
+                    Err(err) => return Err(err).context("get_device_state"),
+                };
                 log::trace!("updated state for {device}");
 
                 {
@@ -280,7 +332,7 @@ impl State {
     ) -> anyhow::Result<()> {
         let value: JsonValue = value.into();
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 log::info!("Using Platform API to send {value:?} control to {device}");
                 client.control_device(info, capability, value).await?;
                 return Ok(());
@@ -329,7 +381,7 @@ impl State {
         }
 
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 log::info!("Using Platform API to set {device} light {instance_name} state");
                 client.set_toggle_state(info, instance_name, on).await?;
                 return Ok(());
@@ -362,7 +414,7 @@ impl State {
         }
 
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 log::info!("Using Platform API to set {device} power state");
                 client.set_power_state(info, on).await?;
                 return Ok(());
@@ -406,7 +458,7 @@ impl State {
         }
 
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 log::info!("Using Platform API to set {device} brightness");
                 client.set_brightness(info, percent).await?;
                 return Ok(());
@@ -442,7 +494,7 @@ impl State {
         }
 
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 log::info!("Using Platform API to set {device} color temperature");
                 client.set_color_temperature(info, kelvin).await?;
                 self.device_mut(&device.sku, &device.id)
@@ -499,7 +551,7 @@ impl State {
         }
 
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 client.set_work_mode(info, work_mode, value).await?;
                 return Ok(());
             }
@@ -549,7 +601,7 @@ impl State {
         }
 
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 log::info!("Using Platform API to set {device} color");
                 client.set_color_rgb(info, r, g, b).await?;
                 self.device_mut(&device.sku, &device.id)
@@ -575,12 +627,6 @@ impl State {
             return;
         }
 
-        // Add a slight delay, as the status returned
-        // by the platform API isn't guaranteed to be
-        // coherent with the command we just issued
-        // right away :-/
-        sleep(Duration::from_secs(5)).await;
-
         log::info!("Polling {device} to get latest state after control");
         if let Err(err) = self.poll_platform_api(&device).await {
             log::error!("Polling {device} failed: {err:#}");
@@ -590,7 +636,7 @@ impl State {
     pub async fn device_list_scenes(&self, device: &Device) -> anyhow::Result<Vec<String>> {
         // TODO: some plumbing to maintain offline scene controls for preferred-LAN control
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 return Ok(sort_and_dedup_scenes(client.list_scene_names(info).await?));
             }
         }
@@ -607,7 +653,7 @@ impl State {
         target: TemperatureValue,
     ) -> anyhow::Result<()> {
         if let Some(client) = self.get_platform_client().await {
-            if let Some(info) = &device.http_device_info {
+            if let Some(info) = device.http_device_info() {
                 log::info!("Using Platform API to set {device} target temperature to {target}");
                 client
                     .set_target_temperature(info, instance_name, target)
@@ -629,7 +675,7 @@ impl State {
 
         if !avoid_platform_api {
             if let Some(client) = self.get_platform_client().await {
-                if let Some(info) = &device.http_device_info {
+                if let Some(info) = device.http_device_info() {
                     log::info!("Using Platform API to set {device} to scene {scene}");
                     client.set_scene_by_name(info, scene).await?;
                     self.device_mut(&device.sku, &device.id)
@@ -669,8 +715,56 @@ impl State {
     }
 }
 
+/// Returns true if `label` identifies the device by its name, computed
+/// name, id, topic id or LAN address. `ip` is `label` parsed as an
+/// address, if it is one. The names are compared without allocating
+/// where possible, leaving the formatted computed name until last.
+fn device_matches_label(d: &Device, label: &str, ip: Option<IpAddr>) -> bool {
+    d.govee_name()
+        .map(|name| name.eq_ignore_ascii_case(label))
+        .unwrap_or(false)
+        || d.id.eq_ignore_ascii_case(label)
+        || topic_safe_id(d).eq_ignore_ascii_case(label)
+        || (ip.is_some() && d.ip_addr() == ip)
+        || d.computed_name().eq_ignore_ascii_case(label)
+}
+
 pub fn sort_and_dedup_scenes(mut scenes: Vec<String>) -> Vec<String> {
     scenes.sort_by_key(|s| s.to_ascii_lowercase());
     scenes.dedup();
     scenes
 }
+
+#[cfg(test)]
+mod test {
+    use super::*;
+    use crate::platform_api::{DeviceType, HttpDeviceInfo};
+
+    fn matches(d: &Device, label: &str) -> bool {
+        device_matches_label(d, label, label.parse().ok())
+    }
+
+    #[test]
+    fn label_matching() {
+        let mut device = Device::new("H6000", "AA:BB:CC:DD:EE:FF:42:2A");
+        // Without a Govee name, the computed name is the name
+        assert!(matches(&device, "h6000_422a"));
+        assert!(!matches(&device, "Kitchen"));
+
+        device.set_http_device_info(HttpDeviceInfo {
+            sku: device.sku.clone(),
+            device: device.id.clone(),
+            device_name: "Kitchen".to_string(),
+            device_type: DeviceType::Light,
+            capabilities: vec![],
+        });
+        assert!(matches(&device, "kitchen"));
+        // The computed name continues to match once a Govee name
+        // is known, as it always has
+        assert!(matches(&device, "H6000_422A"));
+        assert!(matches(&device, "aa:bb:cc:dd:ee:ff:42:2a"));
+        assert!(matches(&device, "AABBCCDDEEFF422A"));
+        assert!(!matches(&device, "10.0.0.2"));
+        assert!(!matches(&device, "Bedroom"));
+    }
+}